@@ -1,27 +1,38 @@
 # filename: get_musicbrainz_ids.py
 import argparse
 import os
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import orjson
 import requests
-from typing import Optional, Dict, Any, List
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, Any, List, Tuple
 from dotenv import load_dotenv
 
 MB_BASE = "https://musicbrainz.org/ws/2/artist/"
 UA = os.getenv("MUSICBRAINZ_UA", "mbid_to_lidarr/1.0 (you@example.com)")
 REQUEST_INTERVAL_SECONDS = float(os.getenv("MB_REQUEST_INTERVAL_SECONDS", "1.0"))
+# Lookups in flight at once; the rate limiter still caps how often they start
+MB_MAX_WORKERS = 4
+# Pause until the window resets once X-RateLimit-Remaining drops to this many
+RATE_LIMIT_REMAINING_THRESHOLD = 2
+# Upper bound on a header-driven pause, in case of clock skew or a bogus reset time
+MAX_RATE_LIMIT_WAIT_SECONDS = 60.0
 
 # Lucene metacharacters to escape inside query strings
-_LUCENE_META = set('+ - && || ! ( ) { } [ ] ^ " ~ * ? : \\ /'.split())
+_LUCENE_RE = re.compile(r'([+\-!(){}\[\]^"~*?:\\/]|&&|\|\|)')
 
+@lru_cache(maxsize=4096)
 def lucene_escape(s: str) -> str:
-    out = []
-    for ch in s:
-        if ch in _LUCENE_META:
-            out.append("\\" + ch)
-        else:
-            out.append(ch)
-    return "".join(out)
+    if not _LUCENE_RE.search(s):
+        return s
+    return _LUCENE_RE.sub(r"\\\1", s)
 
+@lru_cache(maxsize=4096)
 def build_query(artist_name: str) -> str:
     # exact-phrase search in the artist field, falling back to general text
     esc = lucene_escape(artist_name)
@@ -32,30 +43,77 @@ def select_best(candidates: List[Dict[str, Any]], artist_name: str) -> Optional[
         return None
     # Prefer exact (casefold) name match or alias, else best score
     an = artist_name.casefold()
-    def is_exact(a):
-        if a.get("name", "").casefold() == an:
-            return True
-        for al in a.get("aliases", []):
-            if al.get("name", "").casefold() == an:
-                return True
-        return False
-
-    exacts = [a for a in candidates if is_exact(a)]
+    exacts = [
+        a for a in candidates
+        if a.get("name", "").casefold() == an
+        or any(al.get("name", "").casefold() == an for al in a.get("aliases", ()))
+    ]
     pool = exacts if exacts else candidates
 
-    # Highest score first
-    pool.sort(key=lambda a: a.get("score", 0), reverse=True)
+    # Highest score wins; max() leaves the caller's list untouched
+    top = max(pool, key=lambda a: a.get("score", 0))
 
     # Optional: nudge groups/people if you care:
-    # pool.sort(key=lambda a: (a.get("type") in {"Group","Person"}, a.get("score",0)), reverse=True)
+    # top = max(pool, key=lambda a: (a.get("type") in {"Group","Person"}, a.get("score",0)))
 
     # If the top score is too low, bail out (tune threshold as needed)
-    top = pool[0]
     if top.get("score", 0) < 80:
         return None
     return top
 
-def get_artist(session: requests.Session, artist_name: str) -> Optional[Dict[str, Any]]:
+def build_session(user_agent: str = UA) -> requests.Session:
+    """Return a MusicBrainz session with pooled keep-alive connections.
+
+    urllib3 only retries connection errors here; 429/503 responses are left to
+    get_artist so the rate limiter sees them and backs off before the retry.
+    """
+    session = requests.Session()
+    session.headers.update({"User-Agent": user_agent})
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        # urllib3 retries 429/503 that carry Retry-After even without a
+        # status_forcelist; turn that off so they reach the limiter
+        max_retries=Retry(total=3, backoff_factor=0.5, respect_retry_after_header=False),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+class RateLimiter:
+    """Thread-safe limiter that spaces request starts at least ``min_interval`` apart."""
+
+    def __init__(self, min_interval: float) -> None:
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def defer(self, seconds: float) -> None:
+        """Hold back every caller's next request for at least ``seconds``."""
+        seconds = min(seconds, MAX_RATE_LIMIT_WAIT_SECONDS)
+        with self._lock:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+    def observe(self, headers: Any) -> None:
+        """Throttle ahead of the server using MusicBrainz's X-RateLimit-* headers."""
+        try:
+            remaining = int(headers.get("X-RateLimit-Remaining", ""))
+            reset = float(headers.get("X-RateLimit-Reset", ""))
+        except ValueError:
+            return
+        if remaining <= RATE_LIMIT_REMAINING_THRESHOLD:
+            # Reset is a Unix timestamp, so measure it against the wall clock
+            self.defer(reset - time.time())
+
+def get_artist(session: requests.Session, artist_name: str, limiter: Optional[RateLimiter] = None) -> Optional[Dict[str, Any]]:
     params = {
         "query": build_query(artist_name),
         "fmt": "json",
@@ -63,14 +121,26 @@ def get_artist(session: requests.Session, artist_name: str) -> Optional[Dict[str
         "inc": "aliases"       # include aliases to help exact matching
     }
     while True:
+        if limiter is not None:
+            limiter.wait()
         resp = session.get(MB_BASE, params=params, timeout=15)
+        if limiter is not None:
+            limiter.observe(resp.headers)
         # Handle polite backoff
         if resp.status_code in (429, 503):
-            retry_after = int(resp.headers.get("Retry-After", "2"))
-            time.sleep(retry_after)
+            try:
+                retry_after = float(resp.headers.get("Retry-After", "2"))
+            except ValueError:
+                # HTTP-date or garbage; fall back to the default pause
+                retry_after = 2.0
+            if limiter is not None:
+                # Pause all workers, not just this one; the loop waits on the limiter
+                limiter.defer(retry_after)
+            else:
+                time.sleep(retry_after)
             continue
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
         return select_best(data.get("artists", []), artist_name)
 
 def parse_artists_file(input_path: str) -> List[str]:
@@ -78,29 +148,36 @@ def parse_artists_file(input_path: str) -> List[str]:
 
     The file is expected to contain one artist name per line. Empty lines are ignored.
     """
-    parsed_names: List[str] = []
     with open(input_path, "r", encoding="utf-8") as f:
-        for raw_line in f:
-            line = raw_line.strip()
-            if not line:
-                continue
-            parsed_names.append(line)
+        lines = f.read().splitlines()
+    parsed_names = [s for line in lines if (s := line.strip())]
     # De-duplicate while preserving order
     return list(dict.fromkeys(parsed_names))
 
 def lidarr_tag(mbid: str) -> str:
     return f"lidarr:{mbid}"
 
+def _lookup_artist(session: requests.Session, name: str, limiter: RateLimiter) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    # Return the error instead of printing it so the caller reports it in input order
+    try:
+        return get_artist(session, name, limiter), None
+    except (requests.RequestException, ValueError) as e:
+        return None, f"{name}: ERROR {e}"
+
 def resolve_artists_to_mbids(
     session: requests.Session,
     artist_names: List[str],
     output_path: str,
     append: bool = False,
     min_interval_seconds: float = 1.0,
+    max_workers: int = MB_MAX_WORKERS,
 ) -> List[str]:
     """Resolve a list of artist names to MBIDs, write lidarr:MBID lines, and return MBID list.
 
-    Writes only unique MBIDs; will append if requested. Returns all MBIDs written this run.
+    Lookups run on a small thread pool so request latency overlaps the polite
+    delay; the shared rate limiter still spaces request starts. Results are
+    written by the calling thread in input order. Writes only unique MBIDs;
+    will append if requested. Returns all MBIDs written this run.
     """
     results: List[Dict[str, Any]] = []
     written_mbids: set[str] = set()
@@ -113,25 +190,25 @@ def resolve_artists_to_mbids(
                         written_mbids.add(s[7:])
         except OSError:
             pass
-    last_call = 0.0
+    limiter = RateLimiter(min_interval_seconds)
     new_mbids: List[str] = []
     mode = "a" if append else "w"
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
     try:
         dirpath = os.path.dirname(output_path)
         if dirpath:
             os.makedirs(dirpath, exist_ok=True)
         with open(output_path, mode, encoding="utf-8") as out_f:
-            for name in dict.fromkeys(artist_names):
-                elapsed = time.time() - last_call
-                if elapsed < min_interval_seconds:
-                    time.sleep(min_interval_seconds - elapsed)
-                try:
-                    artist = get_artist(session, name)
-                except requests.RequestException as e:
-                    print(f"{name}: ERROR {e}")
-                    artist = None
-                finally:
-                    last_call = time.time()
+            futures = [
+                (name, executor.submit(_lookup_artist, session, name, limiter))
+                for name in dict.fromkeys(artist_names)
+            ]
+            # Consume in input order so this thread is the only writer and the
+            # output order is the same on every run
+            for name, future in futures:
+                artist, error = future.result()
+                if error:
+                    print(error)
                 row = {
                     "input_artist": name,
                     "musicbrainz_id": artist.get("id") if artist else "",
@@ -146,11 +223,13 @@ def resolve_artists_to_mbids(
                 mbid = row["musicbrainz_id"]
                 if mbid and mbid not in written_mbids:
                     out_f.write(lidarr_tag(mbid) + "\n")
-                    out_f.flush()
                     written_mbids.add(mbid)
                     new_mbids.append(mbid)
     except KeyboardInterrupt:
         print("\nInterrupted. Progress saved to output file.")
+    finally:
+        # Drop queued lookups so an interrupt doesn't wait for the whole list
+        executor.shutdown(wait=False, cancel_futures=True)
     return new_mbids
 
 def main():
@@ -170,8 +249,7 @@ def main():
         print(f"No artist names found in {args.input_path}.")
         return
 
-    session = requests.Session()
-    session.headers.update({"User-Agent": UA})
+    session = build_session()
 
     resolve_artists_to_mbids(
         session=session,
@@ -1,58 +1,132 @@
 import argparse
-from typing import Dict, Any, List, Optional, Set
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import time
+from typing import Dict, Any, List, Optional, Set, Tuple
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
 from dotenv import load_dotenv
 
 RETRY_STATUS = {429, 503}
 MAX_RETRIES = 3
-BASE_BACKOFF_SECONDS = 2.0
+BASE_BACKOFF_SECONDS = 0.5
+# Minimum seconds between full artist-list refetches after an ambiguous add error
+EXISTS_REFRESH_COOLDOWN_SECONDS = 60.0
+# Upper bound on concurrent MBIDs; AIMDController picks the actual limit below it
+MAX_WORKERS = 32
+# Starting concurrency; AIMDController backs off from here or grows toward MAX_WORKERS
+INITIAL_CONCURRENCY = 16
 
-def request_with_retry(session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
-    attempt = 0
-    last_exc: Optional[Exception] = None
-    last_retry_resp: Optional[requests.Response] = None
-    while attempt <= MAX_RETRIES:
+def build_session() -> requests.Session:
+    """Return a session with pooled keep-alive connections and urllib3 retries.
+
+    Connection errors and RETRY_STATUS responses are retried with exponential
+    backoff, honouring Retry-After. Once retries run out the last response is
+    returned so callers see it as an HTTPError.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(
+            total=MAX_RETRIES,
+            backoff_factor=BASE_BACKOFF_SECONDS,
+            status_forcelist=tuple(RETRY_STATUS),
+            allowed_methods=frozenset(["GET", "POST"]),
+            raise_on_status=False,
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+class AIMDController:
+    """Adaptive concurrency limit for Lidarr calls.
+
+    The limit starts at ``initial``, grows additively by ``alpha`` after each
+    healthy response that came back within ``target_latency`` seconds, and is
+    multiplied by ``beta`` on server errors, throttling (RETRY_STATUS) or
+    transport failures. Healthy but slower responses leave it unchanged.
+    """
+
+    def __init__(
+        self,
+        cmin: int = 1,
+        cmax: int = 32,
+        initial: int = INITIAL_CONCURRENCY,
+        target_latency: float = 0.5,
+        alpha: float = 0.5,
+        beta: float = 0.5,
+    ) -> None:
+        self.cmin = cmin
+        self.cmax = cmax
+        self.target_latency = target_latency
+        self.alpha = alpha
+        self.beta = beta
+        self._limit = float(min(cmax, max(cmin, initial)))
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self, latency: float, ok: bool) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            if not ok:
+                self._limit = max(float(self.cmin), self._limit * self.beta)
+            elif latency <= self.target_latency:
+                self._limit = min(float(self.cmax), self._limit + self.alpha)
+            self._cond.notify_all()
+
+def request_with_retry(
+    session: requests.Session,
+    method: str,
+    url: str,
+    controller: Optional[AIMDController] = None,
+    **kwargs,
+) -> requests.Response:
+    # Retries and Retry-After handling live in the session adapter (see build_session)
+    if controller is None:
+        resp = session.request(method, url, **kwargs)
+    else:
+        controller.acquire()
+        started = time.monotonic()
+        ok = False
         try:
             resp = session.request(method, url, **kwargs)
-            if resp.status_code in RETRY_STATUS:
-                last_retry_resp = resp
-                retry_after = resp.headers.get("Retry-After")
-                if retry_after is not None:
-                    try:
-                        wait_s = float(retry_after)
-                    except ValueError:
-                        wait_s = BASE_BACKOFF_SECONDS * (2 ** attempt)
-                else:
-                    wait_s = BASE_BACKOFF_SECONDS * (2 ** attempt)
-                time.sleep(wait_s)
-                attempt += 1
-                continue
-            resp.raise_for_status()
-            return resp
-        except requests.RequestException as e:
-            last_exc = e
-            if attempt >= MAX_RETRIES:
-                break
-            time.sleep(BASE_BACKOFF_SECONDS * (2 ** attempt))
-            attempt += 1
-    # Exhausted retries: raise the last retryable HTTP response if present, else the last exception
-    if last_retry_resp is not None:
-        last_retry_resp.raise_for_status()
-    if last_exc is not None:
-        raise last_exc
-    raise requests.HTTPError(f"Request failed after {MAX_RETRIES} retries: {method} {url}")
+            # Throttled attempts the adapter already retried still mean "back off"
+            retries = getattr(resp.raw, "retries", None)
+            throttled = resp.status_code in RETRY_STATUS or any(
+                h.status in RETRY_STATUS for h in getattr(retries, "history", ())
+            )
+            ok = resp.status_code < 500 and not throttled
+        finally:
+            controller.release(time.monotonic() - started, ok)
+    resp.raise_for_status()
+    return resp
 
 
 def build_headers(api_key: str) -> Dict[str, str]:
     return {"X-Api-Key": api_key, "Content-Type": "application/json"}
 
-def search_artist(session: requests.Session, base_url: str, headers: Dict[str, str], term: str) -> List[Dict[str, Any]]:
+def search_artist(
+    session: requests.Session,
+    base_url: str,
+    headers: Dict[str, str],
+    term: str,
+    controller: Optional[AIMDController] = None,
+) -> List[Dict[str, Any]]:
     url = f"{base_url}/api/v1/artist/lookup"
     params = {"term": term}
-    response = request_with_retry(session, "GET", url, headers=headers, params=params, timeout=30)
-    return response.json()
+    response = request_with_retry(session, "GET", url, controller, headers=headers, params=params, timeout=30)
+    return orjson.loads(response.content)
 
 def add_artist(
     session: requests.Session,
@@ -64,6 +138,7 @@ def add_artist(
     root_folder: str,
     monitor_option: str,
     search_missing: bool,
+    controller: Optional[AIMDController] = None,
 ) -> Dict[str, Any]:
     url = f"{base_url}/api/v1/artist"
     payload = {
@@ -77,29 +152,80 @@ def add_artist(
         "addOptions": {"monitor": monitor_option, "searchForMissingAlbums": search_missing},
         "tags": artist.get("tags", []),
     }
-    response = request_with_retry(session, "POST", url, headers=headers, json=payload, timeout=30)
-    return response.json()
+    response = request_with_retry(session, "POST", url, controller, headers=headers, json=payload, timeout=30)
+    return orjson.loads(response.content)
 
-def get_existing_foreign_ids(session: requests.Session, base_url: str, headers: Dict[str, str]) -> Set[str]:
-    """Fetch all artists currently in Lidarr and return their foreignArtistId set."""
+def get_existing_artists(session: requests.Session, base_url: str, headers: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch all artists currently in Lidarr, keyed by foreignArtistId."""
     url = f"{base_url}/api/v1/artist"
     resp = request_with_retry(session, "GET", url, headers=headers, timeout=30)
     try:
-        items = resp.json()
+        items = orjson.loads(resp.content)
     except ValueError:
         items = []
-    existing: Set[str] = set()
+    existing: Dict[str, Dict[str, Any]] = {}
     for it in items or []:
         fa = it.get("foreignArtistId")
         if fa:
-            existing.add(fa)
+            existing[fa] = it
     return existing
 
+def get_existing_foreign_ids(session: requests.Session, base_url: str, headers: Dict[str, str]) -> Set[str]:
+    """Fetch all artists currently in Lidarr and return their foreignArtistId set."""
+    return set(get_existing_artists(session, base_url, headers))
+
+def is_artist_exists_error(response: requests.Response) -> bool:
+    """Return True if a Lidarr validation error body says the artist is already added."""
+    try:
+        body = orjson.loads(response.content)
+    except ValueError:
+        return False
+    failures = body if isinstance(body, list) else [body]
+    for failure in failures:
+        if not isinstance(failure, dict):
+            continue
+        if failure.get("errorCode") == "ArtistExistsValidator":
+            return True
+        if "already been added" in str(failure.get("errorMessage", "")).lower():
+            return True
+    return False
+
+class ExistingIdsRefresher:
+    """Refetch Lidarr's artist list into ``existing_ids``, at most once per ``cooldown`` seconds."""
+
+    def __init__(
+        self,
+        session: requests.Session,
+        base_url: str,
+        headers: Dict[str, str],
+        existing_ids: Set[str],
+        cooldown: float = EXISTS_REFRESH_COOLDOWN_SECONDS,
+    ) -> None:
+        self.session = session
+        self.base_url = base_url
+        self.headers = headers
+        self.existing_ids = existing_ids
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._last_refresh: Optional[float] = None
+
+    def refresh(self) -> Set[str]:
+        # Held across the fetch so concurrent callers wait for, then share, one refetch
+        with self._lock:
+            now = time.monotonic()
+            if self._last_refresh is None or now - self._last_refresh >= self.cooldown:
+                self._last_refresh = now
+                try:
+                    self.existing_ids.update(get_existing_foreign_ids(self.session, self.base_url, self.headers))
+                except requests.RequestException:
+                    pass
+            return self.existing_ids
+
 def get_root_folders(session: requests.Session, base_url: str, headers: Dict[str, str]) -> List[Dict[str, Any]]:
     url = f"{base_url}/api/v1/rootFolder"
     resp = request_with_retry(session, "GET", url, headers=headers, timeout=30)
     try:
-        return resp.json() or []
+        return orjson.loads(resp.content) or []
     except ValueError:
         return []
 
@@ -110,7 +236,7 @@ def get_quality_profiles(session: requests.Session, base_url: str, headers: Dict
     url = f"{base_url}/api/v1/qualityprofile"
     resp = request_with_retry(session, "GET", url, headers=headers, timeout=30)
     try:
-        return resp.json() or []
+        return orjson.loads(resp.content) or []
     except ValueError:
         return []
 
@@ -118,24 +244,110 @@ def get_metadata_profiles(session: requests.Session, base_url: str, headers: Dic
     url = f"{base_url}/api/v1/metadataprofile"
     resp = request_with_retry(session, "GET", url, headers=headers, timeout=30)
     try:
-        return resp.json() or []
+        return orjson.loads(resp.content) or []
     except ValueError:
         return []
 
 def parse_input_file(path: str) -> List[str]:
-    mbids: List[str] = []
     with open(path, "r", encoding="utf-8") as f:
-        for raw in f:
-            s = raw.strip()
-            if not s:
-                continue
-            if s.startswith("lidarr:"):
-                s = s.split(":", 1)[1].strip()
-            mbids.append(s)
+        lines = f.read().splitlines()
+    mbids = [s[7:].strip() if s.startswith("lidarr:") else s for line in lines if (s := line.strip())]
     # de-dupe preserving order
     return list(dict.fromkeys(mbids))
 
-def main():
+def process_mbid(
+    session: requests.Session,
+    base_url: str,
+    headers: Dict[str, str],
+    mbid: str,
+    existing_ids: Set[str],
+    effective_quality_id: int,
+    effective_metadata_id: int,
+    root_folder: str,
+    monitor_option: str,
+    search_missing: bool,
+    dry_run: bool,
+    controller: Optional[AIMDController] = None,
+    refresher: Optional[ExistingIdsRefresher] = None,
+    stop: Optional[threading.Event] = None,
+) -> Tuple[str, str, List[str]]:
+    """Look up and add a single MBID.
+
+    Returns the stats key, the report line and the console messages; the caller
+    prints them so output from concurrent workers stays in input order.
+    """
+    messages: List[str] = []
+    term = f"lidarr:{mbid}"
+    try:
+        results = search_artist(session, base_url, headers, term, controller)
+    except (requests.RequestException, ValueError) as e:
+        messages.append(f"{mbid}: LOOKUP ERROR {e}")
+        return "lookup_error", f"{mbid}\tLOOKUP_ERROR\t-\t{e}", messages
+    if not results:
+        messages.append(f"{mbid}: no lookup results")
+        return "lookup_error", f"{mbid}\tNO_RESULTS\t-\tno lookup results", messages
+    cand = None
+    for r in results:
+        if r.get("foreignArtistId") == mbid:
+            cand = r
+            break
+    if cand is None:
+        cand = results[0]
+    name = cand.get("artistName", "<unknown>")
+    dis = cand.get("disambiguation", "N/A")
+    messages.append(f"Found: {name} ({dis}) -> {mbid}")
+    if dry_run:
+        return "dry_run", f"{mbid}\tDRY_RUN\t{name}\t-", messages
+    # The run was cut short; don't add artists nobody will report
+    if stop is not None and stop.is_set():
+        return "add_error", f"{mbid}\tADD_ERROR\t{name}\tinterrupted", messages
+    # Prefer non-zero profile ids from lookup, else fallback to effective ids
+    lookup_quality_id = int(cand.get("qualityProfileId") or 0)
+    lookup_metadata_id = int(cand.get("metadataProfileId") or 0)
+    chosen_quality_id = lookup_quality_id or effective_quality_id
+    chosen_metadata_id = lookup_metadata_id or effective_metadata_id
+    # Debug: print chosen profile IDs to help diagnose 400s
+    messages.append(f"Using profiles -> qualityProfileId={chosen_quality_id}, metadataProfileId={chosen_metadata_id}")
+    try:
+        added_item = add_artist(
+            session,
+            base_url,
+            headers,
+            cand,
+            chosen_quality_id,
+            chosen_metadata_id,
+            root_folder,
+            monitor_option,
+            search_missing,
+            controller,
+        )
+        messages.append(f"Added: {added_item.get('artistName', name)}")
+        existing_ids.add(mbid)
+        return "success", f"{mbid}\tADDED\t{name}\t-", messages
+    except requests.HTTPError as e:
+        status = getattr(e.response, "status_code", None)
+        try:
+            detail = e.response.text
+        except Exception:
+            detail = str(e)
+        # Lidarr names the duplicate in its validation body; only refetch the
+        # library (rate-limited) when neither the body nor the precheck set decides it
+        exists = False
+        if status in (400, 409):
+            exists = is_artist_exists_error(e.response) or mbid in existing_ids
+            if not exists and refresher is not None:
+                exists = mbid in refresher.refresh()
+        if exists:
+            messages.append(f"{name}: already exists (HTTP {status})")
+            existing_ids.add(mbid)
+            return "exists", f"{mbid}\tEXISTS\t{name}\tHTTP {status}", messages
+        messages.append(f"{name}: ADD ERROR HTTP {status}: {detail}")
+        return "add_error", f"{mbid}\tADD_ERROR\t{name}\tHTTP {status}: {detail}", messages
+    except (requests.RequestException, ValueError) as e:
+        messages.append(f"{name}: ADD ERROR {e}")
+        return "add_error", f"{mbid}\tADD_ERROR\t{name}\t{e}", messages
+
+def main(argv: Optional[List[str]] = None):
     load_dotenv()
     parser = argparse.ArgumentParser(description="Add/monitor artists in Lidarr from an MBID list.")
     parser.add_argument("--input", default="output/mbids.txt", help="Path to input file (lines of 'lidarr:<mbid>' or '<mbid>')")
@@ -159,7 +371,7 @@ def main():
     )
     parser.add_argument("--lidarr-url", default=os.getenv("LIDARR_URL", "http://localhost:8686"), help="Base URL for Lidarr (no trailing slash)")
     parser.add_argument("--api-key", default=os.getenv("LIDARR_API_KEY", ""), help="Lidarr API key")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     mbids = parse_input_file(args.input)
     if args.limit and args.limit > 0:
@@ -174,7 +386,7 @@ def main():
         print("ERROR: Missing Lidarr API key. Set --api-key or LIDARR_API_KEY in .env")
         return
     headers = build_headers(api_key)
-    session = requests.Session()
+    session = build_session()
     # Validate root folder path against Lidarr configuration
     configured_roots = get_root_folders(session, base_url, headers)
     desired_root = normalize_path(args.root)
@@ -189,18 +401,19 @@ def main():
         else:
             print("  (no root folders returned by Lidarr)")
         return
+    # Fetch profiles once; they serve both default resolution and validation
+    try:
+        q_profiles = get_quality_profiles(session, base_url, headers)
+    except requests.RequestException:
+        q_profiles = []
+    try:
+        m_profiles = get_metadata_profiles(session, base_url, headers)
+    except requests.RequestException:
+        m_profiles = []
     # Resolve quality/metadata profile IDs
     effective_quality_id = args.quality_profile_id
     effective_metadata_id = args.metadata_profile_id
     if args.use_default_profiles or effective_quality_id <= 0 or effective_metadata_id <= 0:
-        try:
-            q_profiles = get_quality_profiles(session, base_url, headers)
-        except requests.RequestException as e:
-            q_profiles = []
-        try:
-            m_profiles = get_metadata_profiles(session, base_url, headers)
-        except requests.RequestException as e:
-            m_profiles = []
         def pick_default(profiles):
             if not profiles:
                 return 0
@@ -214,14 +427,8 @@ def main():
         if effective_metadata_id <= 0:
             effective_metadata_id = pick_default(m_profiles)
     # Validate chosen profile IDs exist (best-effort)
-    try:
-        q_ids = {int(p.get("id")) for p in get_quality_profiles(session, base_url, headers)}
-    except requests.RequestException:
-        q_ids = set()
-    try:
-        m_ids = {int(p.get("id")) for p in get_metadata_profiles(session, base_url, headers)}
-    except requests.RequestException:
-        m_ids = set()
+    q_ids = {int(p.get("id")) for p in q_profiles}
+    m_ids = {int(p.get("id")) for p in m_profiles}
     if effective_quality_id <= 0 or (q_ids and effective_quality_id not in q_ids):
         print(f"ERROR: invalid quality profile id: {effective_quality_id}")
         if q_ids:
@@ -233,116 +440,79 @@ def main():
             print(f"  available metadata profile ids: {sorted(m_ids)}")
         return
 
-    # Preload existing foreignArtistIds to avoid duplicate add attempts
+    # Preload existing artists to avoid duplicate add attempts; the records
+    # answer the precheck without a per-MBID lookup
     try:
-        existing_ids = get_existing_foreign_ids(session, base_url, headers)
+        existing_by_mbid = get_existing_artists(session, base_url, headers)
     except requests.RequestException as e:
         print(f"WARNING: could not load existing artists: {e}")
-        existing_ids = set()
+        existing_by_mbid = {}
+    existing_ids = set(existing_by_mbid)
     stats = {"success": 0, "exists": 0, "lookup_error": 0, "add_error": 0, "dry_run": 0}
 
-    # Fresh report each run
-    try:
-        os.makedirs(os.path.dirname(args.report), exist_ok=True)
-        os.remove(args.report)
-    except FileNotFoundError:
-        pass
-
-    def write_report_line(line: str) -> None:
-        with open(args.report, "a", encoding="utf-8") as rf:
-            rf.write(line + "\n")
-
-    for mbid in mbids:
-        # Skip if already present
-        if mbid in existing_ids:
-            write_report_line(f"{mbid}\tEXISTS\t-\tprecheck")
-            stats["exists"] += 1
-            print(f"{mbid}: already present (precheck)")
-            continue
-        term = f"lidarr:{mbid}"
-        try:
-            results = search_artist(session, base_url, headers, term)
-        except requests.RequestException as e:
-            msg = f"{mbid}\tLOOKUP_ERROR\t-\t{e}"
-            print(f"{mbid}: LOOKUP ERROR {e}")
-            write_report_line(msg)
-            stats["lookup_error"] += 1
-            continue
-        if not results:
-            msg = f"{mbid}\tNO_RESULTS\t-\tno lookup results"
-            print(f"{mbid}: no lookup results")
-            write_report_line(msg)
-            stats["lookup_error"] += 1
-            continue
-        cand = None
-        for r in results:
-            if r.get("foreignArtistId") == mbid:
-                cand = r
-                break
-        if cand is None:
-            cand = results[0]
-        name = cand.get("artistName", "<unknown>")
-        dis = cand.get("disambiguation", "N/A")
-        print(f"Found: {name} ({dis}) -> {mbid}")
-        if args.dry_run:
-            write_report_line(f"{mbid}\tDRY_RUN\t{name}\t-")
-            stats["dry_run"] += 1
-            continue
-        # Prefer non-zero profile ids from lookup, else fallback to effective ids
-        lookup_quality_id = int(cand.get("qualityProfileId") or 0)
-        lookup_metadata_id = int(cand.get("metadataProfileId") or 0)
-        chosen_quality_id = lookup_quality_id or effective_quality_id
-        chosen_metadata_id = lookup_metadata_id or effective_metadata_id
-        # Debug: print chosen profile IDs to help diagnose 400s
-        print(f"Using profiles -> qualityProfileId={chosen_quality_id}, metadataProfileId={chosen_metadata_id}")
+    # Fresh report each run; line-buffered so a crash still leaves a readable report
+    report_dir = os.path.dirname(args.report)
+    if report_dir:
+        os.makedirs(report_dir, exist_ok=True)
+    with open(args.report, "w", encoding="utf-8", buffering=1) as report_f:
+        def write_report_line(line: str) -> None:
+            report_f.write(line + "\n")
+
+        controller = AIMDController(cmax=MAX_WORKERS)
+        refresher = ExistingIdsRefresher(session, base_url, headers, existing_ids)
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
         try:
-            added_item = add_artist(
-                session,
-                base_url,
-                headers,
-                cand,
-                chosen_quality_id,
-                chosen_metadata_id,
-                args.root,
-                args.monitor,
-                args.search_missing,
+            # Precheck against the startup snapshot; workers grow existing_ids as they go
+            futures = {
+                mbid: executor.submit(
+                    process_mbid,
+                    session,
+                    base_url,
+                    headers,
+                    mbid,
+                    existing_ids,
+                    effective_quality_id,
+                    effective_metadata_id,
+                    args.root,
+                    args.monitor,
+                    args.search_missing,
+                    args.dry_run,
+                    controller,
+                    refresher,
+                    stop,
+                )
+                for mbid in mbids
+                if mbid not in existing_by_mbid
+            }
+            # Workers only return results; this thread owns the report, stats and
+            # console output, consumed in input order so reports diff cleanly
+            for mbid in mbids:
+                future = futures.get(mbid)
+                if future is None:
+                    name = existing_by_mbid[mbid].get("artistName") or "-"
+                    write_report_line(f"{mbid}\tEXISTS\t{name}\tprecheck")
+                    stats["exists"] += 1
+                    print(f"{mbid}: {name} already present (precheck)")
+                    continue
+                stat, line, messages = future.result()
+                for message in messages:
+                    print(message)
+                write_report_line(line)
+                stats[stat] += 1
+        except KeyboardInterrupt:
+            print("\nInterrupted. Partial results saved to report.")
+        finally:
+            # Drop queued adds and stop in-flight ones before their POST, so an
+            # interrupt or error doesn't wait for the whole list
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            # Write summary, partial if the run was cut short
+            summary = (
+                f"SUMMARY\tADDED={stats['success']}\tEXISTS={stats['exists']}\t"
+                f"LOOKUP_ERROR={stats['lookup_error']}\tADD_ERROR={stats['add_error']}\tDRY_RUN={stats['dry_run']}"
             )
-            print(f"Added: {added_item.get('artistName', name)}")
-            write_report_line(f"{mbid}\tADDED\t{name}\t-")
-            stats["success"] += 1
-            existing_ids.add(mbid)
-        except requests.HTTPError as e:
-            status = getattr(e.response, "status_code", None)
-            try:
-                detail = e.response.text
-            except Exception:
-                detail = str(e)
-            # Re-check existence after error to avoid misclassifying validation errors
-            try:
-                # Refresh existing set minimally
-                current_existing = get_existing_foreign_ids(session, base_url, headers)
-            except requests.RequestException:
-                current_existing = existing_ids
-            if status in (400, 409) and mbid in current_existing:
-                print(f"{name}: already exists (HTTP {status})")
-                write_report_line(f"{mbid}\tEXISTS\t{name}\tHTTP {status}")
-                stats["exists"] += 1
-                existing_ids.add(mbid)
-            else:
-                print(f"{name}: ADD ERROR HTTP {status}: {detail}")
-                write_report_line(f"{mbid}\tADD_ERROR\t{name}\tHTTP {status}: {detail}")
-                stats["add_error"] += 1
-        except requests.RequestException as e:
-            print(f"{name}: ADD ERROR {e}")
-            write_report_line(f"{mbid}\tADD_ERROR\t{name}\t{e}")
-            stats["add_error"] += 1
-
-    # Write summary
-    summary = (
-        f"SUMMARY\tADDED={stats['success']}\tEXISTS={stats['exists']}\t"
-        f"LOOKUP_ERROR={stats['lookup_error']}\tADD_ERROR={stats['add_error']}\tDRY_RUN={stats['dry_run']}"
-    )
-    write_report_line(summary)
+            write_report_line(summary)
 
 if __name__ == "__main__":
     main()
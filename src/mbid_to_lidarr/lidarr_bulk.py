@@ -2,9 +2,8 @@ import argparse
 import os
 from typing import List
 from dotenv import load_dotenv
-import requests
 
-from .get_musicbrainz_ids import parse_artists_file, resolve_artists_to_mbids
+from .get_musicbrainz_ids import build_session as build_mb_session, parse_artists_file, resolve_artists_to_mbids
 from .lidarr_add import main as lidarr_add_main
 
 
@@ -24,9 +23,6 @@ def run_bulk(
     mb_interval: float,
     mb_user_agent: str,
 ) -> None:
-    session = requests.Session()
-    session.headers.update({"User-Agent": mb_user_agent})
-
     artist_names: List[str] = parse_artists_file(artists_path)
     if limit and limit > 0:
         artist_names = artist_names[:limit]
@@ -34,38 +30,34 @@ def run_bulk(
         print(f"No artist names found in {artists_path}.")
         return
 
+    # MusicBrainz leaves 429/503 to its rate limiter; lidarr_add builds its own
+    # session, which retries them in urllib3
+    mb_session = build_mb_session(mb_user_agent)
     new_mbids = resolve_artists_to_mbids(
-        session=session,
+        session=mb_session,
         artist_names=artist_names,
         output_path=mbids_output,
         append=False,
         min_interval_seconds=mb_interval,
     )
 
-    # Chain into lidarr_add via CLI-style invocation by adjusting argv
-    import sys
-    saved_argv = sys.argv
-    try:
-        sys.argv = [
-            "lidarr_add",
-            "--input", mbids_output,
-            "--root", lidarr_root,
-            "--lidarr-url", lidarr_url,
-            "--api-key", api_key,
-            "--report", report_path,
-            "--monitor", monitor,
-        ] + (
-            ["--search-missing"] if search_missing else []
-        ) + (
-            ["--use-default-profiles"] if use_default_profiles else []
-        ) + (
-            ["--quality-profile-id", str(quality_profile_id)] if quality_profile_id > 0 else []
-        ) + (
-            ["--metadata-profile-id", str(metadata_profile_id)] if metadata_profile_id > 0 else []
-        )
-        lidarr_add_main()
-    finally:
-        sys.argv = saved_argv
+    lidarr_add_argv = [
+        "--input", mbids_output,
+        "--root", lidarr_root,
+        "--lidarr-url", lidarr_url,
+        "--api-key", api_key,
+        "--report", report_path,
+        "--monitor", monitor,
+    ] + (
+        ["--search-missing"] if search_missing else []
+    ) + (
+        ["--use-default-profiles"] if use_default_profiles else []
+    ) + (
+        ["--quality-profile-id", str(quality_profile_id)] if quality_profile_id > 0 else []
+    ) + (
+        ["--metadata-profile-id", str(metadata_profile_id)] if metadata_profile_id > 0 else []
+    )
+    lidarr_add_main(argv=lidarr_add_argv)
 
 
 def main():
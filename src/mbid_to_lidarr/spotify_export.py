@@ -1,77 +1,174 @@
 import os
 import argparse
-from typing import Set, Any, Dict, Optional
+from typing import Set, Any, Dict, List, Optional, Tuple
 import threading
 import itertools
+import mmap
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import sys
-import time
 from dotenv import load_dotenv
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import spotipy  # type: ignore
+from spotipy.cache_handler import CacheFileHandler  # type: ignore
 from spotipy.oauth2 import SpotifyOAuth  # type: ignore
 
+# Largest page Spotify accepts on the followed-artists and saved-albums endpoints
+MAX_PAGE_SIZE = 50
+# Offset-paged requests kept in flight once the first page reveals the total
+PREFETCH_WORKERS = 4
+# Output at least this large is written through mmap instead of write()
+MMAP_THRESHOLD_BYTES = 1 << 20
+
+# Env is fixed once main() has run load_dotenv(); missing keys raise and are not cached
+@lru_cache(maxsize=None)
 def get_env_var(key: str) -> str:
     value = os.getenv(key)
     if value is None:
         raise Exception(f"Missing {key} in .env.")
     return value
 
+def get_page_size() -> int:
+    """Read SPOTIFY_PAGE_SIZE, clamped to the 1..MAX_PAGE_SIZE range Spotify accepts."""
+    try:
+        size = int(os.getenv('SPOTIFY_PAGE_SIZE', str(MAX_PAGE_SIZE)))
+    except ValueError:
+        size = MAX_PAGE_SIZE
+    return min(MAX_PAGE_SIZE, max(1, size))
+
 def get_repo_root() -> str:
     return os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..'))
 
-def build_client(include_saved_albums: bool) -> Any:
+class MemoizedCacheFileHandler(CacheFileHandler):
+    """Token cache that reads the cache file once, then serves the token from memory.
+
+    SpotifyOAuth asks the cache handler for the token before every API call; new
+    or refreshed tokens are still written through to disk as they arrive.
+    """
+
+    _UNSET: Any = object()
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._token_info: Any = self._UNSET
+
+    def get_cached_token(self) -> Optional[Dict[str, Any]]:
+        if self._token_info is self._UNSET:
+            self._token_info = super().get_cached_token()
+        return self._token_info
+
+    def save_token_to_cache(self, token_info: Dict[str, Any]) -> None:
+        self._token_info = token_info
+        super().save_token_to_cache(token_info)
+
+def _use_orjson(response: requests.Response, *args: Any, **kwargs: Any) -> requests.Response:
+    # Spotipy decodes every page via response.json(); swap in orjson for this session only
+    response.json = lambda **_: orjson.loads(response.content)  # type: ignore[method-assign]
+    return response
+
+def build_session() -> requests.Session:
+    """Return a keep-alive session for Spotify API calls, sized for the page prefetch."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=16,
+        max_retries=Retry(total=5, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504]),
+    )
+    session.mount('https://', adapter)
+    session.hooks['response'].append(_use_orjson)
+    return session
+
+def build_client(include_saved_albums: bool, session: Optional[requests.Session] = None) -> Any:
     scope: str = "user-follow-read" + (" user-library-read" if include_saved_albums else "")
     spotify_client: Any = spotipy.Spotify(auth_manager=SpotifyOAuth(
         client_id=get_env_var('SPOTIFY_CLIENT_ID'),
         client_secret=get_env_var('SPOTIFY_CLIENT_SECRET'),
         redirect_uri=get_env_var('SPOTIFY_REDIRECT_URI'),
         scope=scope,
-        username=get_env_var('SPOTIFY_USERNAME')
-    ))
+        cache_handler=MemoizedCacheFileHandler(username=get_env_var('SPOTIFY_USERNAME')),
+    ), requests_session=session if session is not None else True)
     return spotify_client
 
-def get_followed_artists(sp: Any) -> Set[str]:
+def get_followed_artists(sp: Any, page_size: int = MAX_PAGE_SIZE) -> Set[str]:
     artists: Set[str] = set()
-    results: Optional[Dict[str, Any]] = sp.current_user_followed_artists(limit=50)
+    # Cursor-paged: each request needs the previous page's `after`, so this stays sequential
+    results: Optional[Dict[str, Any]] = sp.current_user_followed_artists(limit=page_size)
     while results:
-        for item in results['artists']['items']:
-            artists.add(item['name'])
+        artists.update(item['name'] for item in results['artists']['items'])
         if results['artists']['next']:
             results = sp.next(results['artists'])
         else:
             break
     return artists
 
-def get_saved_albums_and_artists(sp: Any, artists: Set[str]) -> Set[str]:
+def get_saved_albums_and_artists(sp: Any, page_size: int = MAX_PAGE_SIZE) -> Tuple[Set[str], Set[str]]:
+    """Return (album ids, artist names) from the user's saved albums."""
     albums: Set[str] = set()
-    album_results: Optional[Dict[str, Any]] = sp.current_user_saved_albums(limit=50)
-    while album_results:
-        for item in album_results['items']:
-            album = item['album']
-            albums.add(album['name'])
-            for artist in album['artists']:
-                artists.add(artist['name'])
-        if album_results['next']:
-            album_results = sp.next(album_results)
-        else:
-            break
-    return albums
+    artists: Set[str] = set()
+    # /me/albums has no `fields` filter (only playlist endpoints do), so full album
+    # objects come back; only album id and artist names are read from them
+    first_page: Optional[Dict[str, Any]] = sp.current_user_saved_albums(limit=page_size)
+    if not first_page:
+        return albums, artists
+    # Offset-paged: once the total is known, fetch the remaining pages concurrently
+    offsets = range(page_size, first_page['total'], page_size)
+    with ThreadPoolExecutor(max_workers=PREFETCH_WORKERS) as executor:
+        rest = executor.map(lambda offset: sp.current_user_saved_albums(limit=page_size, offset=offset), offsets)
+        for album_results in itertools.chain([first_page], rest):
+            page = album_results['items']
+            albums.update(item['album']['id'] for item in page)
+            artists.update(artist['name'] for item in page for artist in item['album']['artists'])
+    return albums, artists
+
+def write_lines(out_path: str, lines: List[str]) -> None:
+    """Write ``lines`` newline-terminated as UTF-8, encoded once and written in one pass."""
+    data = ("\n".join(lines) + "\n").encode('utf-8') if lines else b""
+    if len(data) < MMAP_THRESHOLD_BYTES:
+        # Raw fd: no TextIOWrapper/BufferedWriter copies, one write() per chunk
+        fd = os.open(out_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o666)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        return
+    # Large dumps: size the file up front and copy straight into the page cache
+    with open(out_path, 'w+b') as f:
+        f.truncate(len(data))
+        with mmap.mmap(f.fileno(), len(data)) as mm:
+            mm[:] = data
 
 class Spinner:
+    """Progress spinner on stderr; a no-op when stderr is not a terminal (pipes, CI logs)."""
+
+    TICK_SECONDS = 0.25
+
     def __init__(self, message: str = "Processing") -> None:
         self._stop = threading.Event()
         self._thread: Optional[threading.Thread] = None
+        self._stream = sys.stderr
+        self._tty = self._stream.isatty()
         self.message = message
 
     def start(self) -> None:
+        if not self._tty:
+            return
+
         def run() -> None:
+            # wait() doubles as the tick and returns as soon as stop() sets the event
+            line = ""
             for c in itertools.cycle("|/-\\"):
-                if self._stop.is_set():
+                line = f"{self.message}... {c}"
+                self._stream.write(f"\r{line}")
+                self._stream.flush()
+                if self._stop.wait(self.TICK_SECONDS):
                     break
-                sys.stdout.write(f"\r{self.message}... {c}")
-                sys.stdout.flush()
-                time.sleep(0.1)
-            sys.stdout.write("\r")
-            sys.stdout.flush()
+            self._stream.write("\r" + " " * len(line) + "\r")
+            self._stream.flush()
 
         self._thread = threading.Thread(target=run)
         self._thread.daemon = True
@@ -90,31 +187,42 @@ def main() -> None:
     parser.add_argument('--include-saved-albums', action='store_true', help='Also scan saved albums (requires user-library-read scope).')
     parser.add_argument('--out', default=os.getenv('ARTISTS_FILE', 'artists.txt'), help='Output path for artist list (default: artists.txt)')
     args: argparse.Namespace = parser.parse_args()
+    page_size: int = get_page_size()
 
-    sp: Any = build_client(include_saved_albums=bool(args.include_saved_albums))
-
-    spinner = Spinner("Fetching Spotify data")
+    session = build_session()
     try:
-        spinner.start()
-        artists: Set[str] = get_followed_artists(sp)
-        albums: Set[str] = set()
+        sp: Any = build_client(include_saved_albums=bool(args.include_saved_albums), session=session)
+        # Authorize (browser prompt / local callback server) on this thread, before
+        # the spinner and the fetch workers start; they then share the cached token
+        sp.auth_manager.get_access_token(as_dict=False)
+
+        spinner = Spinner("Fetching Spotify data")
+        try:
+            spinner.start()
+            # Followed artists and saved albums are independent endpoints; fetch both at once
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                followed = executor.submit(get_followed_artists, sp, page_size)
+                saved = executor.submit(get_saved_albums_and_artists, sp, page_size) if args.include_saved_albums else None
+                artists: Set[str] = followed.result()
+                albums: Set[str] = set()
+                if saved is not None:
+                    albums, album_artists = saved.result()
+                    artists |= album_artists
+        finally:
+            spinner.stop()
+
+        if args.dryrun:
+            print(f"[DRYRUN] Found {len(artists)} unique artists" + (f" and {len(albums)} unique albums" if args.include_saved_albums else "") + ".")
+            return
+
+        out_path: str = args.out
+        write_lines(out_path, sorted(artists))
         if args.include_saved_albums:
-            albums = get_saved_albums_and_artists(sp, artists)
+            print(f"Wrote {len(artists)} artists (and scanned {len(albums)} albums) to {out_path}")
+        else:
+            print(f"Wrote {len(artists)} artists to {out_path}")
     finally:
-        spinner.stop()
-
-    if args.dryrun:
-        print(f"[DRYRUN] Found {len(artists)} unique artists" + (f" and {len(albums)} unique albums" if args.include_saved_albums else "") + ".")
-        return
-
-    out_path: str = args.out
-    with open(out_path, 'w', encoding='utf-8') as f:
-        for artist in sorted(artists):
-            f.write(f"{artist}\n")
-    if args.include_saved_albums:
-        print(f"Wrote {len(artists)} artists (and scanned {len(albums)} albums) to {out_path}")
-    else:
-        print(f"Wrote {len(artists)} artists to {out_path}")
+        session.close()
 
 
 if __name__ == "__main__":